@@ -1,6 +1,48 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 import pandas as pd
-import altair as alt
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# numba is optional: when it is installed and the filtered frame is very large,
+# the monthly-churn count runs through a parallel JIT kernel instead of the
+# pandas groupby. Everything works without it.
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Below this row count the pandas groupby is plenty fast and JIT compilation
+# overhead would dominate.
+NUMBA_MIN_ROWS = 2_000_000
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _churn_counts_by_month(status_codes, churned_code, end_months, min_month, n_months):
+        """
+        Counts churned rows per month in one parallel pass over the raw code
+        arrays: no Python objects, no intermediate hash tables. Each chunk
+        accumulates into its own row of 'partial' so the parallel loop is
+        race-free, then the partials are reduced.
+        """
+        n = len(status_codes)
+        n_chunks = 64
+        chunk = (n + n_chunks - 1) // n_chunks
+        partial = np.zeros((n_chunks, n_months), dtype=np.int64)
+        for c in prange(n_chunks):
+            lo = c * chunk
+            hi = min(n, lo + chunk)
+            for i in range(lo, hi):
+                if status_codes[i] == churned_code:
+                    partial[c, end_months[i] - min_month] += 1
+        counts = np.zeros(n_months, dtype=np.int64)
+        for m in range(n_months):
+            for c in range(n_chunks):
+                counts[m] += partial[c, m]
+        return counts
 
 # --- Page Configuration ---
 # Set up the page layout, title, and icon
@@ -12,41 +54,325 @@ st.set_page_config(
 )
 
 # --- Data Loading and Cleaning ---
+# The dashboard only ever touches these columns, so we skip the rest at load time.
+USED_COLUMNS = ['CustomerID', 'Region', 'PlanType', 'Status', 'StartDate', 'EndDate', 'MonthlyRevenue', 'NPS']
+
+# How many rows the raw-data expander shows. Serializing millions of rows to
+# the browser on every rerun is the alternative.
+PREVIEW_ROWS = 1000
+
+# Explicit dtypes for the CSV fallback: skips read_csv's whole-file type
+# inference scan and reads the filter columns straight into categoricals.
+# The numeric columns load as float32 so rows with missing values survive;
+# load_data downcasts them to small integers afterwards. Status stays a plain
+# string here because it is whitespace-trimmed before categorization.
+CSV_DTYPES = {'Region': 'category', 'PlanType': 'category', 'MonthlyRevenue': 'float32', 'NPS': 'float32'}
+
+# Chunk size for the CSV fallback, so cleaning happens on bounded slices
+# instead of a fully materialized raw frame.
+CSV_CHUNK_ROWS = 200_000
+
 # Cache the data loading to improve performance
 @st.cache_data
-def load_data(file_path):
+def load_data(parquet_path, csv_path):
     """
-    Loads and cleans the customer subscription data from a CSV file.
-    It converts date columns to datetime objects, fills missing EndDates with the current date,
-    and handles potential errors.
+    Loads and cleans the customer subscription data.
+    It prefers the Parquet file (written by prepare_data.py) because Parquet stores
+    dtypes natively: dates come back as datetime64 with no parsing, and only the
+    columns the dashboard uses are read. If the Parquet file is missing it falls
+    back to parsing the CSV.
     """
     try:
-        df = pd.read_csv(file_path)
-        
-        # Clean column names by removing leading/trailing whitespace
-        df.columns = df.columns.str.strip()
-        
-        # Convert date columns to datetime format. 'coerce' will turn invalid dates into NaT (Not a Time).
-        df['StartDate'] = pd.to_datetime(df['StartDate'], errors='coerce')
-        df['EndDate'] = pd.to_datetime(df['EndDate'], errors='coerce')
-        
-        # *** NEW: Fill missing EndDate values with today's date ***
-        # This treats active subscriptions as ongoing until the present day.
-        df['EndDate'].fillna(pd.to_datetime('today').normalize(), inplace=True)
-        
-        # Drop rows if critical information like StartDate or CustomerID is missing
-        df.dropna(subset=['StartDate', 'CustomerID', 'Status'], inplace=True)
-        
-        # Clean the 'Status' column data to remove extra whitespace
-        df['Status'] = df['Status'].str.strip()
-        
-        return df
+        df = pd.read_parquet(parquet_path, columns=USED_COLUMNS)
+    except FileNotFoundError:
+        # Fall back to the CSV. Run 'python prepare_data.py' to enable the fast
+        # path. The CSV is read in chunks with preset dtypes, and each chunk is
+        # cleaned and pruned before the next one loads, so peak memory stays
+        # bounded and no inference pass over the whole file is needed.
+        try:
+            chunks = []
+            with pd.read_csv(csv_path, dtype=CSV_DTYPES, chunksize=CSV_CHUNK_ROWS) as reader:
+                for chunk in reader:
+                    # Clean column names by removing leading/trailing whitespace
+                    # (only reassign if any name actually changes)
+                    stripped = chunk.columns.str.strip()
+                    if not stripped.equals(chunk.columns):
+                        chunk.columns = stripped
+
+                    # Convert date columns to datetime format. 'coerce' will turn invalid dates into NaT (Not a Time).
+                    chunk['StartDate'] = pd.to_datetime(chunk['StartDate'], errors='coerce')
+                    chunk['EndDate'] = pd.to_datetime(chunk['EndDate'], errors='coerce')
+
+                    # Drop unusable rows and unused columns before the chunk
+                    # joins the full frame
+                    chunk = chunk.dropna(subset=['StartDate', 'CustomerID', 'Status'])
+                    chunks.append(chunk[USED_COLUMNS])
+        except FileNotFoundError:
+            st.error(f"Error: Neither '{parquet_path}' nor '{csv_path}' was found. Please double-check these two things:")
+            st.error("1. The script 'app.py' is in the EXACT same folder as your data file.")
+            st.error(f"2. The data file is named EXACTLY: '{csv_path}'")
+            return None
+
+        df = pd.concat(chunks)
+
+    # Fill missing EndDate values with today's date.
+    # This treats active subscriptions as ongoing until the present day.
+    df['EndDate'] = df['EndDate'].fillna(pd.to_datetime('today').normalize())
+
+    # Drop rows if critical information like StartDate or CustomerID is missing
+    df.dropna(subset=['StartDate', 'CustomerID', 'Status'], inplace=True)
+
+    # Clean the 'Status' column data to remove extra whitespace, using
+    # PyArrow's C trim kernel rather than a Python-level string loop
+    df['Status'] = pd.array(pc.utf8_trim_whitespace(pa.array(df['Status'])), dtype='string[pyarrow]')
+
+    # The filter columns are low-cardinality, so store them as categoricals:
+    # isin and groupby then work on small integer codes instead of hashing
+    # strings, and each column shrinks to roughly a byte per row.
+    for col in ('Region', 'PlanType', 'Status'):
+        df[col] = df[col].astype('category')
+
+    # Shrink the numeric columns to the smallest dtype that holds them: NPS
+    # (0-10) fits int8 and MonthlyRevenue a small int, cutting the bytes every
+    # scan touches. CustomerID is a string key ('CUST...') and stays as-is.
+    df['NPS'] = pd.to_numeric(df['NPS'], downcast='integer')
+    df['MonthlyRevenue'] = pd.to_numeric(df['MonthlyRevenue'], downcast='integer')
+
+    # Precompute a tiny per-(Region, PlanType, Status) summary once at load
+    # time. The KPI block can then aggregate this handful of rows instead of
+    # re-hashing every CustomerID on each rerun.
+    summary = (
+        df.groupby(['Region', 'PlanType', 'Status'], observed=True, sort=False)
+        .agg(n_cust=('CustomerID', 'nunique'), mrr=('MonthlyRevenue', 'sum'))
+        .reset_index()
+    )
+
+    return df, summary
+
+@st.cache_data
+def load_parquet_bytes(path):
+    """
+    Raw bytes of the Parquet file, cached for the download button.
+    Returns None when the file is missing (CSV-only setups).
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
     except FileNotFoundError:
-        st.error(f"Error: The file '{file_path}' was not found. Please double-check these two things:")
-        st.error("1. The script 'app.py' is in the EXACT same folder as your data file.")
-        st.error(f"2. The data file is named EXACTLY: '{file_path}'")
         return None
 
+# --- Filtering and Aggregation ---
+# Memoized on the selection tuples: toggling a filter and toggling it back is a
+# cache hit and skips all pandas work. The dataframe argument is prefixed with
+# an underscore so Streamlit does not hash the full frame on every rerun (the
+# data itself is already cached by load_data).
+@st.cache_data(max_entries=32)
+def compute_views(_df, _summary, regions, plan_types, statuses):
+    """
+    Applies the sidebar filters in a single pass and computes every aggregate
+    the dashboard needs: KPI numbers, the monthly churn trend, MRR by region,
+    and churn counts by plan type. Doing all of this in one place means the
+    full dataframe is filtered exactly once per unique selection and the charts
+    receive only small, pre-aggregated frames. Returns None if nothing matches.
+    """
+    df = _df
+    # Build one keep/drop flag per *category* (a handful of values), then gather
+    # those flags through the per-row integer codes. This replaces three
+    # hash-based isin passes with three plain array lookups.
+    keep_region = np.isin(df['Region'].cat.categories.to_numpy(), regions)
+    keep_plan = np.isin(df['PlanType'].cat.categories.to_numpy(), plan_types)
+    keep_status = np.isin(df['Status'].cat.categories.to_numpy(), statuses)
+    mask = (
+        keep_region[df['Region'].cat.codes.to_numpy()] &
+        keep_plan[df['PlanType'].cat.codes.to_numpy()] &
+        keep_status[df['Status'].cat.codes.to_numpy()]
+    )
+    filtered_df = df[mask]
+
+    if filtered_df.empty:
+        return None
+
+    # KPI numbers come from the precomputed summary: filtering and summing a
+    # few dozen rows instead of counting unique CustomerIDs over the full frame.
+    s = _summary[
+        _summary['Region'].isin(regions) &
+        _summary['PlanType'].isin(plan_types) &
+        _summary['Status'].isin(statuses)
+    ]
+    total_customers = int(s['n_cust'].sum())
+    churned_customers = int(s.loc[s['Status'] == 'Churned', 'n_cust'].sum())
+    churn_rate = (churned_customers / total_customers) * 100 if total_customers > 0 else 0
+    total_mrr = s['mrr'].sum()
+
+    def churn_frames():
+        # Churn charts: one pass over the churned subset feeds both the monthly
+        # trend and the per-plan counts. A single (ChurnMonth, PlanType)
+        # group-by produces a small cube, and each chart frame is a cheap
+        # roll-up of it — the pandas equivalent of a GROUPING SETS query over
+        # one scan. astype('datetime64[M]') truncates to month start in one
+        # vectorized pass, instead of building a PeriodArray and stringifying
+        # every element.
+        # The churned-row mask is computed once, as an int8 code compare, and
+        # shared by everything below.
+        # Gather only the two columns the churn charts read, not all eight.
+        status_cats = filtered_df['Status'].cat.categories
+        if 'Churned' in status_cats:
+            is_churned = filtered_df['Status'].cat.codes.to_numpy() == status_cats.get_loc('Churned')
+        else:
+            is_churned = np.zeros(len(filtered_df), dtype=bool)
+        churned_data = filtered_df.loc[is_churned, ['EndDate', 'PlanType']]
+        if churned_data.empty:
+            return (pd.DataFrame(columns=['ChurnMonth', 'ChurnCount']),
+                    pd.DataFrame(columns=['PlanType', 'count']))
+
+        if njit is not None and len(filtered_df) >= NUMBA_MIN_ROWS:
+            # Fused JIT path: count churned rows per month directly from the
+            # categorical codes and month-truncated dates, in parallel.
+            status_codes = filtered_df['Status'].cat.codes.to_numpy()
+            churned_code = filtered_df['Status'].cat.categories.get_loc('Churned')
+            end_months = filtered_df['EndDate'].values.astype('datetime64[M]').view('i8')
+            min_month = int(end_months.min())
+            n_months = int(end_months.max()) - min_month + 1
+            counts = _churn_counts_by_month(status_codes, churned_code, end_months, min_month, n_months)
+            month_starts = np.arange(min_month, min_month + n_months).view('datetime64[M]')
+            monthly_churn = pd.DataFrame({
+                'ChurnMonth': month_starts[counts > 0],
+                'ChurnCount': counts[counts > 0],
+            })
+            churn_by_plan = (
+                churned_data.groupby('PlanType', observed=True, sort=False).size()
+                .sort_values(ascending=False).reset_index(name='count')
+            )
+        else:
+            churn_cube = (
+                pd.DataFrame({
+                    'ChurnMonth': churned_data['EndDate'].values.astype('datetime64[M]'),
+                    'PlanType': churned_data['PlanType'].values,
+                })
+                .groupby(['ChurnMonth', 'PlanType'], observed=True, sort=False)
+                .size().reset_index(name='count')
+            )
+            monthly_churn = (
+                churn_cube.groupby('ChurnMonth', sort=False)['count'].sum()
+                .rename('ChurnCount').reset_index()
+            )
+            churn_by_plan = (
+                churn_cube.groupby('PlanType', observed=True, sort=False)['count'].sum()
+                .sort_values(ascending=False).reset_index()
+            )
+        return monthly_churn, churn_by_plan
+
+    def mrr_frame():
+        # MRR by region (observed=True: skip categories the filters excluded)
+        return filtered_df.groupby('Region', observed=True, sort=False)['MonthlyRevenue'].sum().reset_index()
+
+    def nps_frame():
+        # NPS histogram, binned server-side so the chart receives ~10 rows
+        # instead of the whole filtered frame
+        counts, edges = np.histogram(filtered_df['NPS'].to_numpy(), bins=10)
+        return pd.DataFrame({'lo': edges[:-1], 'hi': edges[1:], 'count': counts})
+
+    # The three chart computations are independent and spend their time in
+    # NumPy/pandas kernels that release the GIL, so overlap them on threads.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        churn_future = pool.submit(churn_frames)
+        mrr_future = pool.submit(mrr_frame)
+        nps_future = pool.submit(nps_frame)
+        monthly_churn, churn_by_plan = churn_future.result()
+        mrr_by_region = mrr_future.result()
+        nps_hist = nps_future.result()
+
+    return {
+        'preview': filtered_df.head(PREVIEW_ROWS),
+        'n_rows': len(filtered_df),
+        'kpis': (total_customers, churned_customers, churn_rate, total_mrr),
+        'monthly_churn': monthly_churn,
+        'mrr_by_region': mrr_by_region,
+        'churn_by_plan': churn_by_plan,
+        'nps_hist': nps_hist,
+    }
+
+# --- Chart Spec Builders ---
+# The four charts are simple enough to write as Vega-Lite dict literals, which
+# skips Altair's schema validation and tree traversal on every rebuild (and
+# drops the dependency). Each builder is cached on its tiny aggregated frame,
+# so an unchanged chart is a dict lookup.
+
+def _records(frame):
+    """The frame as JSON-safe records (plain scalars, ISO dates) for inline Vega-Lite data."""
+    return json.loads(frame.to_json(orient='records', date_format='iso'))
+
+# Equivalent of Altair's .interactive(): pan/zoom bound to the scales
+PAN_ZOOM = [{'name': 'pan_zoom', 'select': 'interval', 'bind': 'scales'}]
+
+@st.cache_data(max_entries=32)
+def build_churn_trend_spec(monthly_churn):
+    return {
+        'data': {'values': _records(monthly_churn)},
+        'mark': {'type': 'line', 'point': True, 'strokeWidth': 3},
+        'encoding': {
+            'x': {'field': 'ChurnMonth', 'type': 'temporal', 'title': 'Month of Churn'},
+            'y': {'field': 'ChurnCount', 'type': 'quantitative', 'title': 'Number of Churned Customers'},
+            'tooltip': [
+                {'field': 'ChurnMonth', 'type': 'temporal', 'title': 'Month'},
+                {'field': 'ChurnCount', 'type': 'quantitative', 'title': 'Churn Count'},
+            ],
+        },
+        'params': PAN_ZOOM,
+    }
+
+@st.cache_data(max_entries=32)
+def build_mrr_spec(mrr_by_region):
+    return {
+        'data': {'values': _records(mrr_by_region)},
+        'mark': 'bar',
+        'encoding': {
+            'x': {'field': 'Region', 'type': 'nominal', 'title': 'Region', 'sort': '-y'},
+            'y': {'field': 'MonthlyRevenue', 'type': 'quantitative', 'title': 'Total Monthly Revenue'},
+            'color': {'field': 'Region', 'type': 'nominal', 'legend': None},
+            'tooltip': [
+                {'field': 'Region', 'type': 'nominal', 'title': 'Region'},
+                {'field': 'MonthlyRevenue', 'type': 'quantitative', 'title': 'MRR', 'format': '$,.0f'},
+            ],
+        },
+        'params': PAN_ZOOM,
+    }
+
+@st.cache_data(max_entries=32)
+def build_plan_churn_spec(churn_by_plan):
+    return {
+        'data': {'values': _records(churn_by_plan)},
+        'mark': 'bar',
+        'encoding': {
+            'x': {'field': 'PlanType', 'type': 'nominal', 'title': 'Plan Type', 'sort': '-y'},
+            'y': {'field': 'count', 'type': 'quantitative', 'title': 'Number of Churned Customers'},
+            'color': {'field': 'PlanType', 'type': 'nominal', 'legend': None},
+            'tooltip': [
+                {'field': 'PlanType', 'type': 'nominal'},
+                {'field': 'count', 'type': 'quantitative'},
+            ],
+        },
+        'params': PAN_ZOOM,
+    }
+
+@st.cache_data(max_entries=32)
+def build_nps_spec(nps_hist):
+    return {
+        'data': {'values': _records(nps_hist)},
+        'mark': 'bar',
+        'encoding': {
+            'x': {'field': 'lo', 'type': 'quantitative', 'title': 'NPS Score'},
+            'x2': {'field': 'hi'},
+            'y': {'field': 'count', 'type': 'quantitative', 'title': 'Number of Customers'},
+            'tooltip': [
+                {'field': 'lo', 'type': 'quantitative', 'title': 'NPS From'},
+                {'field': 'hi', 'type': 'quantitative', 'title': 'NPS To'},
+                {'field': 'count', 'type': 'quantitative', 'title': 'Customers'},
+            ],
+        },
+        'params': PAN_ZOOM,
+    }
+
 # --- Main Application Logic ---
 def main():
     """
@@ -55,46 +381,49 @@ def main():
     st.title("📊 Customer Subscription Analytics Dashboard")
     st.markdown("An interactive dashboard to analyze customer behavior, churn, and revenue trends.")
 
-    # This filename has been updated to 'Analytics.csv' as requested.
-    file_to_load = 'Analytics.csv'
-    df = load_data(file_to_load)
+    # Prefer the Parquet file produced by prepare_data.py; fall back to the CSV.
+    data = load_data('Analytics.parquet', 'Analytics.csv')
 
     # Proceed only if the data is loaded successfully
-    if df is not None:
+    if data is not None:
+        df, summary = data
         # --- Sidebar Filters ---
         st.sidebar.header("Dashboard Filters")
         
+        # The filter columns are categorical, so their sorted unique values are
+        # just the category lists: no per-rerun unique scan or sort needed.
+
         # Region Filter in the sidebar
-        regions = sorted(df['Region'].unique())
+        regions = list(df['Region'].cat.categories)
         selected_regions = st.sidebar.multiselect("Region", regions, default=regions)
-        
+
         # Plan Type Filter in the sidebar
-        plan_types = sorted(df['PlanType'].unique())
+        plan_types = list(df['PlanType'].cat.categories)
         selected_plan_types = st.sidebar.multiselect("Plan Type", plan_types, default=plan_types)
-        
+
         # Customer Status Filter in the sidebar
-        statuses = sorted(df['Status'].unique())
+        statuses = list(df['Status'].cat.categories)
         selected_statuses = st.sidebar.multiselect("Customer Status", statuses, default=statuses)
 
-        # Apply all selected filters to the dataframe
-        filtered_df = df[
-            df['Region'].isin(selected_regions) &
-            df['PlanType'].isin(selected_plan_types) &
-            df['Status'].isin(selected_statuses)
-        ]
-        
+        # Apply all selected filters and compute every aggregate in one pass.
+        # Sorted tuples make the cache key independent of click order.
+        views = compute_views(
+            df,
+            summary,
+            tuple(sorted(selected_regions)),
+            tuple(sorted(selected_plan_types)),
+            tuple(sorted(selected_statuses)),
+        )
+
         # Display a warning if no data matches the filters
-        if filtered_df.empty:
+        if views is None:
             st.warning("No data matches the selected filters. Please adjust your selection.")
             return
 
         # --- Key Metrics Display ---
         st.subheader("Key Performance Indicators")
-        
-        total_customers = filtered_df['CustomerID'].nunique()
-        churned_customers = filtered_df[filtered_df['Status'] == 'Churned']['CustomerID'].nunique()
-        churn_rate = (churned_customers / total_customers) * 100 if total_customers > 0 else 0
-        total_mrr = filtered_df['MonthlyRevenue'].sum()
+
+        total_customers, churned_customers, churn_rate, total_mrr = views['kpis']
 
         # Arrange metrics in columns for a clean layout
         col1, col2, col3, col4 = st.columns(4)
@@ -115,32 +444,16 @@ def main():
         with col_left:
             # Chart 1: Monthly Churn Trend
             st.subheader("Monthly Churn Trend")
-            churned_data = filtered_df[filtered_df['Status'] == 'Churned'].copy()
-            if not churned_data.empty:
-                churned_data['ChurnMonth'] = churned_data['EndDate'].dt.to_period('M').astype(str)
-                monthly_churn = churned_data.groupby('ChurnMonth').size().reset_index(name='ChurnCount')
-                
-                churn_chart = alt.Chart(monthly_churn).mark_line(point=True, strokeWidth=3).encode(
-                    x=alt.X('ChurnMonth:T', title='Month of Churn'),
-                    y=alt.Y('ChurnCount:Q', title='Number of Churned Customers'),
-                    tooltip=[alt.Tooltip('ChurnMonth:T', title='Month'), alt.Tooltip('ChurnCount:Q', title='Churn Count')]
-                ).interactive()
-                st.altair_chart(churn_chart, use_container_width=True)
+            monthly_churn = views['monthly_churn']
+            if not monthly_churn.empty:
+                st.vega_lite_chart(build_churn_trend_spec(monthly_churn), use_container_width=True)
             else:
                 st.info("No churned customers in the selected data to display trend.")
         
         with col_right:
             # Chart 2: MRR by Region
             st.subheader("MRR by Region")
-            mrr_by_region = filtered_df.groupby('Region')['MonthlyRevenue'].sum().reset_index()
-            
-            mrr_chart = alt.Chart(mrr_by_region).mark_bar().encode(
-                x=alt.X('Region:N', title='Region', sort='-y'),
-                y=alt.Y('MonthlyRevenue:Q', title='Total Monthly Revenue'),
-                color=alt.Color('Region:N', legend=None),
-                tooltip=[alt.Tooltip('Region:N', title='Region'), alt.Tooltip('MonthlyRevenue:Q', title='MRR', format='$,.0f')]
-            ).interactive()
-            st.altair_chart(mrr_chart, use_container_width=True)
+            st.vega_lite_chart(build_mrr_spec(views['mrr_by_region']), use_container_width=True)
 
         st.markdown("---")
         
@@ -149,36 +462,33 @@ def main():
         with col_left2:
             # Chart 3: Churn Distribution by Plan Type
             st.subheader("Churn Distribution by Plan Type")
-            # Create a subset of churned customers first
-            churned_plan_data = filtered_df[filtered_df['Status'] == 'Churned']
+            churn_by_plan = views['churn_by_plan']
             # Only build the chart if there is data
-            if not churned_plan_data.empty:
-                churn_by_plan = churned_plan_data['PlanType'].value_counts().reset_index()
-                
-                plan_churn_chart = alt.Chart(churn_by_plan).mark_bar().encode(
-                    x=alt.X('PlanType:N', title='Plan Type', sort='-y'),
-                    y=alt.Y('count:Q', title='Number of Churned Customers'),
-                    color=alt.Color('PlanType:N', legend=None),
-                    tooltip=['PlanType', 'count']
-                ).interactive()
-                st.altair_chart(plan_churn_chart, use_container_width=True)
+            if not churn_by_plan.empty:
+                st.vega_lite_chart(build_plan_churn_spec(churn_by_plan), use_container_width=True)
             else:
                 st.info("No churned customers to display for this chart.")
 
         with col_right2:
-            # Chart 4: NPS Score Distribution
+            # Chart 4: NPS Score Distribution (bins are precomputed server-side)
             st.subheader("NPS Score Distribution")
-            nps_chart = alt.Chart(filtered_df).mark_bar().encode(
-                x=alt.X('NPS:Q', bin=alt.Bin(maxbins=10), title='NPS Score'),
-                y=alt.Y('count()', title='Number of Customers'),
-                tooltip=[alt.Tooltip('NPS:Q', bin=True, title='NPS Range'), 'count()']
-            ).interactive()
-            st.altair_chart(nps_chart, use_container_width=True)
+            st.vega_lite_chart(build_nps_spec(views['nps_hist']), use_container_width=True)
 
         # --- Data Table ---
         st.markdown("---")
         with st.expander("View Raw Data Table", expanded=False):
-            st.dataframe(filtered_df)
+            # Only a capped preview is serialized to the browser; the full
+            # dataset is available through the download button instead.
+            st.dataframe(views['preview'])
+            if views['n_rows'] > len(views['preview']):
+                st.caption(f"Showing the first {len(views['preview']):,} of {views['n_rows']:,} filtered rows.")
+            parquet_bytes = load_parquet_bytes('Analytics.parquet')
+            if parquet_bytes is not None:
+                st.download_button(
+                    "Download full dataset (Parquet)",
+                    parquet_bytes,
+                    file_name='Analytics.parquet',
+                )
 
 # Entry point for the script
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+"""
+One-time preprocessing: convert Analytics.csv into Analytics.parquet.
+
+Run this once (and re-run whenever the CSV changes):
+
+    python prepare_data.py
+
+The Parquet file stores dtypes natively (dates as datetime64, numbers as
+numbers), so the app can load it without re-parsing dates or inferring
+dtypes on every cold cache. Zstd compression keeps the file small.
+"""
+
+import pandas as pd
+
+CSV_PATH = 'Analytics.csv'
+PARQUET_PATH = 'Analytics.parquet'
+
+
+def main():
+    df = pd.read_csv(CSV_PATH)
+
+    # Clean column names by removing leading/trailing whitespace
+    df.columns = df.columns.str.strip()
+
+    # Parse dates once here so the Parquet file carries real datetime columns
+    df['StartDate'] = pd.to_datetime(df['StartDate'], errors='coerce')
+    df['EndDate'] = pd.to_datetime(df['EndDate'], errors='coerce')
+
+    df.to_parquet(PARQUET_PATH, compression='zstd')
+    print(f"Wrote {len(df):,} rows to '{PARQUET_PATH}'")
+
+
+if __name__ == "__main__":
+    main()